@@ -125,42 +125,46 @@ function randomConfirmation() {
     return code;
 }
 
+// Generator for each placeholder token
+const PLACEHOLDER_GENERATORS = {
+    num: randomOrderNumber,
+    tracking: randomTrackingNumber,
+    account: randomAccountNumber,
+    invoice: randomInvoiceNumber,
+    phone: randomPhone,
+    amount: randomAmount,
+    date: randomDate,
+    time: randomTime,
+    url: randomURL,
+    name: randomName,
+    email: randomEmail,
+    company: randomCompany,
+    flight: randomFlightNumber,
+    confirmation: randomConfirmation
+};
+
+// Every placeholder in one alternation, so text is scanned once instead of
+// once per token type
+const PLACEHOLDER_REGEX = new RegExp(`\\{(${Object.keys(PLACEHOLDER_GENERATORS).join('|')})\\}`, 'g');
+
 // Replace placeholder tokens
 function anonymizeText(text) {
     if (!text) return text;
 
-    let result = text;
-
     // Replace placeholders with realistic data
-    result = result.replace(/\{num\}/g, () => randomOrderNumber());
-    result = result.replace(/\{tracking\}/g, () => randomTrackingNumber());
-    result = result.replace(/\{account\}/g, () => randomAccountNumber());
-    result = result.replace(/\{invoice\}/g, () => randomInvoiceNumber());
-    result = result.replace(/\{phone\}/g, () => randomPhone());
-    result = result.replace(/\{amount\}/g, () => randomAmount());
-    result = result.replace(/\{date\}/g, () => randomDate());
-    result = result.replace(/\{time\}/g, () => randomTime());
-    result = result.replace(/\{url\}/g, () => randomURL());
-    result = result.replace(/\{name\}/g, () => randomName());
-    result = result.replace(/\{email\}/g, () => randomEmail());
-    result = result.replace(/\{company\}/g, () => randomCompany());
-    result = result.replace(/\{flight\}/g, () => randomFlightNumber());
-    result = result.replace(/\{confirmation\}/g, () => randomConfirmation());
-
-    return result;
+    return text.replace(PLACEHOLDER_REGEX, (match, token) => PLACEHOLDER_GENERATORS[token]());
 }
 
+// All inappropriate keywords compiled once into a single case-insensitive
+// alternation, so each email is scanned once rather than once per keyword
+const INAPPROPRIATE_REGEX = new RegExp(
+    INAPPROPRIATE_KEYWORDS.map(keyword => keyword.replace(/[.*+?^${}()|[\]\\]/g, '\\$&')).join('|'),
+    'i'
+);
+
 // Check if email contains inappropriate content
 function isInappropriate(email) {
-    const searchText = `${email.subject} ${email.body}`.toLowerCase();
-
-    for (const keyword of INAPPROPRIATE_KEYWORDS) {
-        if (searchText.includes(keyword)) {
-            return true;
-        }
-    }
-
-    return false;
+    return INAPPROPRIATE_REGEX.test(`${email.subject} ${email.body}`);
 }
 
 // Process corpus
@@ -200,8 +204,9 @@ function processCorpus(inputPath, outputPath) {
 
     console.log(`🎯 After removing duplicates: ${unique.length} unique emails`);
 
-    // Write output
-    fs.writeFileSync(outputPath, JSON.stringify(unique, null, 2), 'utf8');
+    // Write output - one compact record per line rather than indent=2, which
+    // roughly doubles the file and the time to write and reload it
+    fs.writeFileSync(outputPath, `[\n${unique.map(email => JSON.stringify(email)).join(',\n')}\n]\n`, 'utf8');
     console.log('✅ Anonymized corpus written to:', outputPath);
 
     // Show stats
@@ -5,6 +5,9 @@
  *
  * Helps identify emails with missing or invalid data in the corpus
  * that could cause classification errors.
+ *
+ * Usage: node scripts/diagnose-email-corpus.js [--count]
+ *   --count  Also count messages in each mbox file (reads every file in full)
  */
 
 const fs = require('fs');
@@ -17,6 +20,10 @@ const CORPUS_PATHS = [
   '/Users/matthanson/Zer0_Inbox/backend/dashboard/data'
 ];
 
+// Counting means reading every mbox end to end (tens of GB for a Takeout
+// export), so the basic check only stats them unless asked
+const COUNT_MBOX_MESSAGES = process.argv.includes('--count');
+
 console.log('📧 Email Corpus Diagnostic Tool\n');
 console.log('Checking for emails with missing or invalid data...\n');
 
@@ -98,12 +105,50 @@ function checkJSONCorpus(filePath) {
   }
 }
 
+// Count messages in an mbox file by scanning raw bytes for "From " separator
+// lines, instead of handing the whole file to an mbox parser
+function countMboxMessages(filePath) {
+  const CHUNK_SIZE = 4 * 1024 * 1024;
+  const separator = Buffer.from('\nFrom ');
+  const buffer = Buffer.alloc(CHUNK_SIZE + separator.length - 1);
+  const fd = fs.openSync(filePath, 'r');
+
+  let count = 0;
+  let carry = 0;
+  let firstChunk = true;
+
+  try {
+    let bytesRead;
+    while ((bytesRead = fs.readSync(fd, buffer, carry, CHUNK_SIZE, null)) > 0) {
+      const end = carry + bytesRead;
+
+      if (firstChunk && buffer.toString('latin1', 0, 5) === 'From ') {
+        count++;
+      }
+      firstChunk = false;
+
+      let pos = buffer.indexOf(separator);
+      while (pos !== -1 && pos + separator.length <= end) {
+        count++;
+        pos = buffer.indexOf(separator, pos + 1);
+      }
+
+      // Keep the tail so a separator split across chunks is still found
+      carry = Math.min(separator.length - 1, end);
+      buffer.copy(buffer, 0, end - carry, end);
+    }
+  } finally {
+    fs.closeSync(fd);
+  }
+
+  return count;
+}
+
 // Check mbox files (basic check)
-function checkMboxFiles(dirPath) {
+function checkMboxFiles(dirPath, files) {
   console.log(`\n📁 Checking mbox files in: ${dirPath}`);
 
   try {
-    const files = fs.readdirSync(dirPath);
     const mboxFiles = files.filter(f => f.endsWith('.mbox'));
 
     console.log(`  Found ${mboxFiles.length} mbox files`);
@@ -112,7 +157,11 @@ function checkMboxFiles(dirPath) {
       const filePath = path.join(dirPath, file);
       const stats = fs.statSync(filePath);
       const sizeMB = (stats.size / (1024 * 1024)).toFixed(2);
-      console.log(`    - ${file}: ${sizeMB} MB`);
+      if (COUNT_MBOX_MESSAGES) {
+        console.log(`    - ${file}: ${sizeMB} MB, ${countMboxMessages(filePath)} messages`);
+      } else {
+        console.log(`    - ${file}: ${sizeMB} MB`);
+      }
     });
 
   } catch (error) {
@@ -128,9 +177,12 @@ CORPUS_PATHS.forEach(corpusPath => {
     const stats = fs.statSync(corpusPath);
 
     if (stats.isDirectory()) {
-      // Check for JSON files in directory
+      // List the directory once and share it between the JSON and mbox
+      // checks; dirent types skip subfolders without a stat each
       try {
-        const files = fs.readdirSync(corpusPath);
+        const files = fs.readdirSync(corpusPath, { withFileTypes: true })
+          .filter(entry => entry.isFile())
+          .map(entry => entry.name);
         const jsonFiles = files.filter(f => f.endsWith('.json'));
 
         jsonFiles.forEach(file => {
@@ -138,7 +190,7 @@ CORPUS_PATHS.forEach(corpusPath => {
         });
 
         // Check for mbox files
-        checkMboxFiles(corpusPath);
+        checkMboxFiles(corpusPath, files);
       } catch (error) {
         console.log(`❌ Error scanning directory: ${error.message}`);
       }
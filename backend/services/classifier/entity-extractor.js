@@ -1069,17 +1069,18 @@ function extractChildren(text) {
     /\b([A-Z][a-z]+)'s\s+(grade|class|teacher)/gi
   ];
 
-  const children = [];
+  // Set keeps first-seen order and dedupes in O(1) per match
+  const children = new Set();
   childPatterns.forEach(pattern => {
     const matches = text.matchAll(pattern);
     for (const match of matches) {
-      if (match[1] && !children.includes(match[1])) {
-        children.push(match[1]);
+      if (match[1]) {
+        children.add(match[1]);
       }
     }
   });
 
-  return children;
+  return [...children];
 }
 
 function extractTeachers(text) {
@@ -1088,18 +1089,15 @@ function extractTeachers(text) {
     /teacher\s+([A-Z][a-z]+\s+[A-Z][a-z]+)/gi
   ];
 
-  const teachers = [];
+  const teachers = new Set();
   teacherPatterns.forEach(pattern => {
     const matches = text.matchAll(pattern);
     for (const match of matches) {
-      const name = match[0].replace(/teacher\s+/gi, '').trim();
-      if (!teachers.includes(name)) {
-        teachers.push(name);
-      }
+      teachers.add(match[0].replace(/teacher\s+/gi, '').trim());
     }
   });
 
-  return teachers;
+  return [...teachers];
 }
 
 function extractSchools(text) {
@@ -1109,21 +1107,19 @@ function extractSchools(text) {
     /([A-Z][a-z]+\s+Preschool)/g
   ];
 
-  const schools = [];
+  const schools = new Set();
   schoolPatterns.forEach(pattern => {
     const matches = text.matchAll(pattern);
     for (const match of matches) {
-      if (!schools.includes(match[1])) {
-        schools.push(match[1]);
-      }
+      schools.add(match[1]);
     }
   });
 
-  return schools;
+  return [...schools];
 }
 
 function extractCompanies(text, email) {
-  const companies = [];
+  const companies = new Set();
 
   const companyPatterns = [
     /\b([A-Z][A-Za-z]+(?:\s+[A-Z][A-Za-z]+){0,2})\s+(?:Inc|LLC|Corp|Corporation|Industries|Systems|Solutions|Technologies)\b/g
@@ -1132,20 +1128,18 @@ function extractCompanies(text, email) {
   companyPatterns.forEach(pattern => {
     const matches = text.matchAll(pattern);
     for (const match of matches) {
-      if (!companies.includes(match[1])) {
-        companies.push(match[1]);
-      }
+      companies.add(match[1]);
     }
   });
 
   if (email && email.from) {
     const companyFromSender = extractCompanyFromSender(email.from);
-    if (companyFromSender && !companies.includes(companyFromSender)) {
-      companies.push(companyFromSender);
+    if (companyFromSender) {
+      companies.add(companyFromSender);
     }
   }
 
-  return companies;
+  return [...companies];
 }
 
 function extractCompanyFromSender(from) {
@@ -1175,9 +1169,10 @@ function extractCompanyFromSender(from) {
 function extractStores(text) {
   const knownStores = ['amazon', 'best buy', 'target', 'walmart', 'techmart', 'modernhome', 'fashionforward'];
   const stores = [];
+  const lowerText = text.toLowerCase();
 
   knownStores.forEach(store => {
-    if (text.toLowerCase().includes(store)) {
+    if (lowerText.includes(store)) {
       stores.push(store.split(' ').map(w => w.charAt(0).toUpperCase() + w.slice(1)).join(' '));
     }
   });
@@ -1206,17 +1201,15 @@ function extractHotels(text) {
     /(Marriott|Hilton|Hyatt|Holiday Inn|Best Western)/gi
   ];
 
-  const hotels = [];
+  const hotels = new Set();
   hotelPatterns.forEach(pattern => {
     const matches = text.matchAll(pattern);
     for (const match of matches) {
-      if (!hotels.includes(match[1])) {
-        hotels.push(match[1]);
-      }
+      hotels.add(match[1]);
     }
   });
 
-  return hotels;
+  return [...hotels];
 }
 
 function extractPromoCodes(text) {
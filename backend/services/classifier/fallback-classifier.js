@@ -240,6 +240,11 @@ function cleanEmailBodyForAI(body) {
 
   let cleaned = body;
 
+  // Remove script/style blocks and comments with their content first -
+  // stripping tags alone leaves CSS and JS source behind as "text"
+  cleaned = cleaned.replace(/<(script|style)\b[\s\S]*?<\/\1\s*>/gi, ' ');
+  cleaned = cleaned.replace(/<!--[\s\S]*?-->/g, ' ');
+
   // Remove HTML tags
   cleaned = cleaned.replace(/<[^>]+>/g, ' ');
 
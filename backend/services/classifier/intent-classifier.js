@@ -77,12 +77,16 @@ function classifyIntent(email) {
     // This allows us to still detect more specific intents within thread replies
   }
 
+  // Normalized fields are built once and shared by every scoring call below,
+  // rather than allocating a fresh context object per intent
+  const fields = { subject, body, from, snippet, fullText };
+
   // Try each intent pattern
   const intentScores = {};
 
   for (const intentId of getAllIntentIds()) {
     const intent = IntentTaxonomy[intentId];
-    let score = calculateIntentScore(intent, { subject, body, from, snippet, fullText });
+    let score = calculateIntentScore(intent, fields);
 
     if (score > 0) {
       intentScores[intentId] = score;
@@ -91,7 +95,7 @@ function classifyIntent(email) {
 
   // Apply entity-based disambiguation boosts
   // This helps differentiate between similar intents (e.g., billing vs e-commerce)
-  applyEntityBasedBoosts(intentScores, { subject, body, snippet, from });
+  applyEntityBasedBoosts(intentScores, fields);
 
   // Find highest scoring intent, preferring specific intents over generic ones
   let maxScore = 0;
@@ -115,7 +119,7 @@ function classifyIntent(email) {
 
   // If confidence is too low, use generic intent
   if (confidence < CONFIDENCE.MIN_THRESHOLD) {
-    detectedIntent = inferGenericIntent({ subject, body, from, snippet });
+    detectedIntent = inferGenericIntent(fields);
     logger.info('Low confidence, using generic intent', {
       originalIntent: detectedIntent,
       confidence,
@@ -136,57 +140,72 @@ function classifyIntent(email) {
   };
 }
 
+/**
+ * Lowercased triggers and negative patterns per intent, computed once per
+ * intent instead of on every keyword of every email
+ */
+const loweredKeywordCache = new WeakMap();
+
+function getLoweredKeywords(intent) {
+  let keywords = loweredKeywordCache.get(intent);
+
+  if (!keywords) {
+    keywords = {
+      triggers: (intent.triggers || []).map(trigger => trigger.toLowerCase()),
+      negativePatterns: (intent.negativePatterns || []).map(pattern => pattern.toLowerCase())
+    };
+    loweredKeywordCache.set(intent, keywords);
+  }
+
+  return keywords;
+}
+
 /**
  * Calculate score for a specific intent based on triggers and patterns
  * Now includes negative pattern matching to reduce false positives
  */
-function calculateIntentScore(intent, { subject, body, from, snippet, fullText }) {
+function calculateIntentScore(intent, fields) {
+  const { subject, body, snippet } = fields;
   let score = 0;
 
-  // Check trigger keywords
-  if (intent.triggers && intent.triggers.length > 0) {
-    for (const trigger of intent.triggers) {
-      const triggerLower = trigger.toLowerCase();
+  const { triggers, negativePatterns } = getLoweredKeywords(intent);
 
-      // Subject match (highest weight)
-      if (subject.includes(triggerLower)) {
-        score += PATTERN_WEIGHTS.SUBJECT_MATCH;
-      }
+  // Check trigger keywords
+  for (const triggerLower of triggers) {
+    // Subject match (highest weight)
+    if (subject.includes(triggerLower)) {
+      score += PATTERN_WEIGHTS.SUBJECT_MATCH;
+    }
 
-      // Snippet match (medium weight)
-      if (snippet.includes(triggerLower)) {
-        score += PATTERN_WEIGHTS.SNIPPET_MATCH;
-      }
+    // Snippet match (medium weight)
+    if (snippet.includes(triggerLower)) {
+      score += PATTERN_WEIGHTS.SNIPPET_MATCH;
+    }
 
-      // Body match (lower weight, but still relevant)
-      if (body.includes(triggerLower)) {
-        score += PATTERN_WEIGHTS.BODY_MATCH;
-      }
+    // Body match (lower weight, but still relevant)
+    if (body.includes(triggerLower)) {
+      score += PATTERN_WEIGHTS.BODY_MATCH;
     }
   }
 
   // Apply negative patterns to penalize false matches
-  if (intent.negativePatterns && intent.negativePatterns.length > 0) {
-    for (const negPattern of intent.negativePatterns) {
-      const negPatternLower = negPattern.toLowerCase();
-
-      // Penalty for negative pattern match (strong penalty)
-      if (subject.includes(negPatternLower)) {
-        score -= PATTERN_WEIGHTS.SUBJECT_MATCH * 1.5; // Stronger penalty than boost
-      }
+  for (const negPatternLower of negativePatterns) {
+    // Penalty for negative pattern match (strong penalty)
+    if (subject.includes(negPatternLower)) {
+      score -= PATTERN_WEIGHTS.SUBJECT_MATCH * 1.5; // Stronger penalty than boost
+    }
 
-      if (snippet.includes(negPatternLower)) {
-        score -= PATTERN_WEIGHTS.SNIPPET_MATCH * 1.5;
-      }
+    if (snippet.includes(negPatternLower)) {
+      score -= PATTERN_WEIGHTS.SNIPPET_MATCH * 1.5;
+    }
 
-      if (body.includes(negPatternLower)) {
-        score -= PATTERN_WEIGHTS.BODY_MATCH * 1.5;
-      }
+    if (body.includes(negPatternLower)) {
+      score -= PATTERN_WEIGHTS.BODY_MATCH * 1.5;
     }
   }
 
   // Category-specific boosting
-  score += applyCategoryBoosts(intent, { subject, body, from, snippet });
+  score += applyCategoryBoosts(intent, fields);
 
   return score;
 }
@@ -461,7 +480,10 @@ function applyCategoryBoosts(intent, { subject, body, from, snippet }) {
       }
 
       // ENHANCED: Emoji-heavy subjects (common in DTC brand marketing)
-      const emojiCount = (subject.match(/[\u{1F300}-\u{1F9FF}]/gu) || []).length;
+      // Cheap non-ASCII test first so plain ASCII subjects skip the unicode-aware scan
+      const emojiCount = /[^\x00-\x7F]/.test(subject)
+        ? (subject.match(/[\u{1F300}-\u{1F9FF}]/gu) || []).length
+        : 0;
       if (emojiCount >= 2) {
         boost += 15 * Math.min(emojiCount, 4); // Cap at 4 emojis
         logger.info('Emoji-heavy marketing subject detected', {
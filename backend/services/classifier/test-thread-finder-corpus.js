@@ -22,23 +22,22 @@ const mockTemplates = JSON.parse(fs.readFileSync(mockTemplatesPath, 'utf8'));
 
 // Parse EML format (simple extraction)
 function parseEML(emlContent) {
-  const lines = emlContent.split('\n');
-  let subject = '';
-  let from = '';
-  let body = '';
-  let inBody = false;
-
-  for (const line of lines) {
-    if (line.startsWith('Subject: ')) {
-      subject = line.substring('Subject: '.length).trim();
-    } else if (line.startsWith('From: ')) {
-      from = line.substring('From: '.length).trim();
-    } else if (line === '' && !inBody) {
-      inBody = true;
-    } else if (inBody && !line.startsWith('--') && !line.startsWith('Content-')) {
-      body += line + '\n';
-    }
-  }
+  // Headers end at the first blank line - only that block is searched for
+  // Subject/From, and the body is taken whole instead of walked line by line
+  const boundary = emlContent.match(/\r?\n\r?\n/);
+  const headers = boundary ? emlContent.substring(0, boundary.index) : emlContent;
+
+  const getHeader = (name) => {
+    const match = headers.match(new RegExp(`^${name}: (.*)$`, 'm'));
+    return match ? match[1].trim() : '';
+  };
+  const subject = getHeader('Subject');
+  const from = getHeader('From');
+
+  // Drop MIME boundary and part-header lines from the body
+  let body = boundary
+    ? `${emlContent.substring(boundary.index + boundary[0].length)}\n`.replace(/^(?:--|Content-)[^\n]*\n/gm, '')
+    : '';
 
   // Extract plain text from multipart email
   const plainTextMatch = body.match(/Content-Type: text\/plain;[\s\S]*?\n\n([\s\S]*?)(?=\n\n----|$)/);
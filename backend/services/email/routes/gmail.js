@@ -525,18 +525,45 @@ router.post('/messages/send', async (req, res) => {
   }
 });
 
+/**
+ * Pick the body part from a list of MIME parts in a single pass
+ * Returns the first text/plain part with data, else the first text/html one
+ * @param {Array} parts - Gmail message parts
+ * @returns {Object|null} { part, isHtml } or null if no part has body data
+ */
+function findBodyPart(parts) {
+  let htmlPart = null;
+
+  for (const part of parts) {
+    if (!part.body?.data) continue;
+    if (part.mimeType === 'text/plain') {
+      return { part, isHtml: false };
+    }
+    if (part.mimeType === 'text/html' && !htmlPart) {
+      htmlPart = part;
+    }
+  }
+
+  return htmlPart ? { part: htmlPart, isHtml: true } : null;
+}
+
 /**
  * Parse Gmail message into standardized format
  * @param {Object} message - Gmail message object
  * @param {Number} threadLength - Optional thread message count
  */
 function parseGmailMessage(message, threadLength = null) {
-  const headers = message.payload.headers;
+  // Index headers by lowercased name once instead of scanning per lookup;
+  // the first occurrence wins, as with a find()
+  const headerValues = new Map();
+  for (const header of message.payload.headers) {
+    const name = header.name.toLowerCase();
+    if (!headerValues.has(name)) {
+      headerValues.set(name, header.value);
+    }
+  }
 
-  const getHeader = (name) => {
-    const header = headers.find(h => h.name.toLowerCase() === name.toLowerCase());
-    return header ? header.value : null;
-  };
+  const getHeader = (name) => headerValues.get(name.toLowerCase()) ?? null;
 
   // Extract body - try text/plain first, then text/html as fallback
   let body = '';
@@ -548,31 +575,22 @@ function parseGmailMessage(message, threadLength = null) {
     isHtml = message.payload.mimeType === 'text/html';
     if (isHtml) htmlBody = body;  // Save original HTML
   } else if (message.payload.parts) {
-    // Try text/plain first
-    let textPart = message.payload.parts.find(part => part.mimeType === 'text/plain');
-
-    // If no text/plain, try text/html as fallback
-    if (!textPart || !textPart.body.data) {
-      textPart = message.payload.parts.find(part => part.mimeType === 'text/html');
-      isHtml = true;
-    }
+    // Try text/plain first, then text/html, at the top level
+    let bodyPart = findBodyPart(message.payload.parts);
 
     // Also check nested multipart/alternative structures
-    if (!textPart || !textPart.body.data) {
+    if (!bodyPart) {
       for (const part of message.payload.parts) {
         if (part.mimeType === 'multipart/alternative' && part.parts) {
-          textPart = part.parts.find(p => p.mimeType === 'text/plain');
-          if (!textPart) {
-            textPart = part.parts.find(p => p.mimeType === 'text/html');
-            isHtml = true;
-          }
-          if (textPart && textPart.body.data) break;
+          bodyPart = findBodyPart(part.parts);
+          if (bodyPart) break;
         }
       }
     }
 
-    if (textPart && textPart.body.data) {
-      body = Buffer.from(textPart.body.data, 'base64').toString('utf-8');
+    if (bodyPart) {
+      body = Buffer.from(bodyPart.part.body.data, 'base64').toString('utf-8');
+      isHtml = bodyPart.isHtml;
       if (isHtml) htmlBody = body;  // Save original HTML before conversion
     }
   }
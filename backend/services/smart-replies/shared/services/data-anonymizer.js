@@ -13,6 +13,7 @@
 
 const crypto = require('crypto');
 const fs = require('fs').promises;
+const { appendFileSync } = require('fs');
 const path = require('path');
 const logger = require('../config/logger');
 
@@ -22,9 +23,45 @@ const ANONYMIZATION_KEY = process.env.ANONYMIZATION_KEY || 'beta-testing-anonymi
 // Audit log path
 const AUDIT_LOG_PATH = path.join(__dirname, '../../data/anonymization-audit.log');
 
+// All PII patterns fused into one alternation so scrubPII makes a single pass
+// over the text instead of one replace() per pattern. Card numbers are tried
+// before phone numbers so a 16-digit card is not partially eaten as a phone.
+const PII_PATTERN = new RegExp([
+  /(?<email>\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}\b)/.source,
+  /(?<card>\b\d{4}[-\s]?\d{4}[-\s]?\d{4}[-\s]?\d{4}\b)/.source,
+  /(?<ssn>\b\d{3}-\d{2}-\d{4}\b)/.source,
+  /(?<phone>(\+\d{1,3}[-.\s]?)?\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}\b)/.source,
+  /(?<name>\b(Mr\.|Mrs\.|Ms\.|Dr\.|Prof\.)\s+[A-Z][a-z]+(\s+[A-Z][a-z]+)?\b)/.source
+].join('|'), 'g');
+
+// Every PII_PATTERN branch needs a digit, an "@" or an honorific, so text with
+// none of them (most subjects and plain prose) can skip the full scan
+const PII_HINT = /[\d@]|(?:Mr|Mrs|Ms|Dr|Prof)\./;
+
+// Fixed replacement tokens for PII types that are redacted rather than hashed
+const PII_REDACTIONS = {
+  card: '[CARD_REDACTED]',
+  ssn: '[SSN_REDACTED]',
+  phone: '[PHONE_REDACTED]'
+};
+
+// Objects returned by anonymizeEmailObject. The _anonymized flag is only a
+// marker for clients - it is a plain property anyone can set, so it must not
+// be trusted to skip scrubbing
+const anonymizedEmails = new WeakSet();
+
 class DataAnonymizer {
   constructor() {
-    this.initAuditLog();
+    // Audit entries are buffered and appended in one write per tick; writes
+    // are chained so batches land in order, after the log header.
+    // auditBatch is the pending { written, resolve, timer } for the buffer
+    this.auditBuffer = [];
+    this.auditBatch = null;
+    this.auditWrite = this.initAuditLog();
+
+    // A process.exit() skips the scheduled flush, so write whatever is still
+    // buffered synchronously. Appends already in flight can still be cut off
+    process.on('exit', () => this.flushAuditLogSync());
   }
 
   /**
@@ -49,22 +86,84 @@ class DataAnonymizer {
 
   /**
    * Log anonymization event to audit trail
+   * Resolves once the batch containing this entry has been written
    */
-  async logAnonymization(operation, details) {
+  logAnonymization(operation, details) {
     const entry = {
       timestamp: new Date().toISOString(),
       operation,
       details
     };
 
-    try {
-      await fs.appendFile(
-        AUDIT_LOG_PATH,
-        JSON.stringify(entry) + '\n'
-      );
-    } catch (error) {
-      logger.error('Failed to write to audit log', { error: error.message });
+    this.auditBuffer.push(JSON.stringify(entry) + '\n');
+
+    // Anonymizing one response logs an entry per email/address, so collect
+    // everything logged in this tick and append it with a single write
+    if (!this.auditBatch) {
+      let resolve;
+      const written = new Promise(r => { resolve = r; });
+      this.auditBatch = {
+        written,
+        resolve,
+        timer: setImmediate(() => this.flushAuditLog())
+      };
+    }
+
+    return this.auditBatch.written;
+  }
+
+  /**
+   * Take the pending batch, cancelling its scheduled flush
+   */
+  takeAuditBatch() {
+    const batch = this.auditBatch;
+    this.auditBatch = null;
+    if (batch) clearImmediate(batch.timer);
+    return batch;
+  }
+
+  /**
+   * Append all buffered audit entries to the log file
+   * Resolves once everything buffered so far has been written
+   */
+  flushAuditLog() {
+    const batch = this.takeAuditBatch();
+
+    if (this.auditBuffer.length > 0) {
+      const lines = this.auditBuffer.join('');
+      this.auditBuffer = [];
+
+      this.auditWrite = this.auditWrite.then(async () => {
+        try {
+          await fs.appendFile(AUDIT_LOG_PATH, lines);
+        } catch (error) {
+          logger.error('Failed to write to audit log', { error: error.message });
+        }
+      });
+    }
+
+    if (batch) batch.resolve(this.auditWrite);
+    return this.auditWrite;
+  }
+
+  /**
+   * Synchronously append buffered audit entries (used on process exit)
+   */
+  flushAuditLogSync() {
+    const batch = this.takeAuditBatch();
+
+    if (this.auditBuffer.length > 0) {
+      const lines = this.auditBuffer.join('');
+      this.auditBuffer = [];
+
+      try {
+        appendFileSync(AUDIT_LOG_PATH, lines);
+      } catch (error) {
+        logger.error('Failed to write to audit log', { error: error.message });
+      }
     }
+
+    if (batch) batch.resolve();
   }
 
   /**
@@ -77,6 +176,22 @@ class DataAnonymizer {
     return hmac.digest('hex');
   }
 
+  /**
+   * Derive the anonymized form of an email address without auditing it
+   */
+  deriveAnonymizedEmail(email) {
+    const hash = this.hashSensitiveData(email).substring(0, 8);
+    return `user_${hash}@anonymized.test`;
+  }
+
+  /**
+   * Derive the anonymized form of a person name without auditing it
+   */
+  deriveAnonymizedName(name) {
+    const hash = this.hashSensitiveData(name).substring(0, 4).toUpperCase();
+    return `User ${hash}`;
+  }
+
   /**
    * Anonymize email address
    * Example: john.doe@example.com -> user_a3f5b8c9@anonymized.test
@@ -84,8 +199,7 @@ class DataAnonymizer {
   anonymizeEmail(email) {
     if (!email) return null;
 
-    const hash = this.hashSensitiveData(email).substring(0, 8);
-    const anonymized = `user_${hash}@anonymized.test`;
+    const anonymized = this.deriveAnonymizedEmail(email);
 
     this.logAnonymization('email_anonymized', {
       originalLength: email.length,
@@ -102,8 +216,7 @@ class DataAnonymizer {
   anonymizeName(name) {
     if (!name) return null;
 
-    const hash = this.hashSensitiveData(name).substring(0, 4).toUpperCase();
-    const anonymized = `User ${hash}`;
+    const anonymized = this.deriveAnonymizedName(name);
 
     this.logAnonymization('name_anonymized', {
       originalLength: name.length,
@@ -133,49 +246,41 @@ class DataAnonymizer {
    * - Physical addresses
    */
   scrubPII(text) {
-    if (!text) return text;
+    if (!text || !PII_HINT.test(text)) return text;
 
-    let scrubbedText = text;
+    // Matches are tallied locally by PII type and audited as one entry below,
+    // rather than appending an email_anonymized/name_anonymized entry per match
     let scrubbedCount = 0;
+    const byType = {};
 
-    // Email addresses
-    const emailRegex = /\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b/g;
-    scrubbedText = scrubbedText.replace(emailRegex, (match) => {
-      scrubbedCount++;
-      return this.anonymizeEmail(match);
-    });
-
-    // Phone numbers (various formats)
-    const phoneRegex = /(\+\d{1,3}[-.\s]?)?\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}\b/g;
-    scrubbedText = scrubbedText.replace(phoneRegex, () => {
-      scrubbedCount++;
-      return '[PHONE_REDACTED]';
-    });
+    // Quoted replies and signatures repeat the same addresses and names, so
+    // derive each distinct value's HMAC once. Scoped to this call so no raw
+    // PII is held in memory once the text has been scrubbed.
+    const derived = new Map();
 
-    // Credit card numbers (simple pattern)
-    const ccRegex = /\b\d{4}[-\s]?\d{4}[-\s]?\d{4}[-\s]?\d{4}\b/g;
-    scrubbedText = scrubbedText.replace(ccRegex, () => {
+    const scrubbedText = text.replace(PII_PATTERN, (match, ...args) => {
+      const groups = args[args.length - 1];
+      const type = Object.keys(groups).find(key => groups[key] !== undefined);
       scrubbedCount++;
-      return '[CARD_REDACTED]';
-    });
+      byType[type] = (byType[type] || 0) + 1;
 
-    // SSN pattern
-    const ssnRegex = /\b\d{3}-\d{2}-\d{4}\b/g;
-    scrubbedText = scrubbedText.replace(ssnRegex, () => {
-      scrubbedCount++;
-      return '[SSN_REDACTED]';
-    });
+      if (type !== 'email' && type !== 'name') return PII_REDACTIONS[type];
 
-    // Names in common patterns (Mr., Mrs., Dr., etc.)
-    const titleRegex = /\b(Mr\.|Mrs\.|Ms\.|Dr\.|Prof\.)\s+[A-Z][a-z]+(\s+[A-Z][a-z]+)?\b/g;
-    scrubbedText = scrubbedText.replace(titleRegex, (match) => {
-      scrubbedCount++;
-      return this.anonymizeName(match);
+      const key = `${type}:${match}`;
+      let replacement = derived.get(key);
+      if (replacement === undefined) {
+        replacement = type === 'email'
+          ? this.deriveAnonymizedEmail(match)
+          : this.deriveAnonymizedName(match);
+        derived.set(key, replacement);
+      }
+      return replacement;
     });
 
     if (scrubbedCount > 0) {
       this.logAnonymization('pii_scrubbed', {
         itemsRedacted: scrubbedCount,
+        byType,
         originalLength: text.length,
         scrubbedLength: scrubbedText.length
       });
@@ -190,6 +295,10 @@ class DataAnonymizer {
   anonymizeEmailObject(email) {
     if (!email) return null;
 
+    // Already anonymized by this process - scrubbing again is wasted work and
+    // would re-hash ids
+    if (anonymizedEmails.has(email)) return email;
+
     const anonymized = {
       ...email,
       // Anonymize identifiers
@@ -227,6 +336,7 @@ class DataAnonymizer {
       toCount: email.to?.length || 0
     });
 
+    anonymizedEmails.add(anonymized);
     return anonymized;
   }
 
@@ -244,6 +354,7 @@ class DataAnonymizer {
    */
   async getAnonymizationStats() {
     try {
+      await this.flushAuditLog();
       const auditLog = await fs.readFile(AUDIT_LOG_PATH, 'utf-8');
       const entries = auditLog
         .split('\n')
@@ -260,12 +371,18 @@ class DataAnonymizer {
       const stats = {
         totalOperations: entries.length,
         byOperation: {},
+        piiByType: {},
         firstOperation: entries[0]?.timestamp,
         lastOperation: entries[entries.length - 1]?.timestamp
       };
 
       entries.forEach(entry => {
         stats.byOperation[entry.operation] = (stats.byOperation[entry.operation] || 0) + 1;
+
+        // Per-type counts recorded while scrubbing (absent on older entries)
+        Object.entries(entry.details?.byType || {}).forEach(([type, count]) => {
+          stats.piiByType[type] = (stats.piiByType[type] || 0) + count;
+        });
       });
 
       return stats;
@@ -280,6 +397,7 @@ class DataAnonymizer {
    */
   async exportAuditLog() {
     try {
+      await this.flushAuditLog();
       const auditLog = await fs.readFile(AUDIT_LOG_PATH, 'utf-8');
       return auditLog;
     } catch (error) {
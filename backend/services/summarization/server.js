@@ -18,6 +18,12 @@ const PROJECT_ID = process.env.GOOGLE_PROJECT_ID || 'gen-lang-client-0622702687'
 const LOCATION = process.env.VERTEX_AI_LOCATION || 'us-central1';
 const MODEL_NAME = 'gemini-2.0-flash-exp'; // Gemini 2.0 Flash for fast, high-quality summarization
 
+// Longest HTML stripHtml keeps once scripts, styles and comments are gone.
+// Prompts use at most 10K chars of the stripped text, so 20x that leaves room
+// for markup while keeping the remaining regex passes bounded on multi-MB
+// marketing emails
+const MAX_HTML_SCAN_LENGTH = 200000;
+
 // Initialize Vertex AI client
 const vertexAI = new VertexAI({
   project: PROJECT_ID,
@@ -628,18 +634,32 @@ function fallbackSummarization(email) {
   };
 }
 
+// MIME part headers that leak into bodies, matched as whole lines
+const MIME_HEADER_LINE_REGEX = /^(?:Content-Type|Content-Transfer-Encoding|MIME-Version|Content-Disposition|Content-ID):.*$/gm;
+
+// Common HTML entities, decoded in a single pass by stripHtml
+const HTML_ENTITIES = {
+  '&nbsp;': ' ',
+  '&amp;': '&',
+  '&lt;': '<',
+  '&gt;': '>',
+  '&quot;': '"',
+  '&#39;': "'",
+  '&apos;': "'",
+  '&mdash;': '—',
+  '&ndash;': '–',
+  '&hellip;': '...'
+};
+const HTML_ENTITY_REGEX = new RegExp(Object.keys(HTML_ENTITIES).join('|'), 'g');
+
 /**
  * Clean email body - remove MIME headers and decode encoding
  */
 function cleanEmailBody(body) {
   if (!body) return '';
 
-  // Remove MIME headers that leak into body
-  body = body.replace(/^Content-Type:.*$/gm, '');
-  body = body.replace(/^Content-Transfer-Encoding:.*$/gm, '');
-  body = body.replace(/^MIME-Version:.*$/gm, '');
-  body = body.replace(/^Content-Disposition:.*$/gm, '');
-  body = body.replace(/^Content-ID:.*$/gm, '');
+  // Remove MIME headers that leak into body (one pass for all header names)
+  body = body.replace(MIME_HEADER_LINE_REGEX, '');
 
   // Decode quoted-printable encoding (=3D → =, =E2=80=99 → ', etc.)
   // First handle soft line breaks (= at end of line)
@@ -681,12 +701,18 @@ function stripHtml(html) {
   if (!html) return '';
 
   // Remove script and style tags with their content
-  let text = html.replace(/<script\b[^<]*(?:(?!<\/script>)<[^<]*)*<\/script>/gi, '');
-  text = text.replace(/<style\b[^<]*(?:(?!<\/style>)<[^<]*)*<\/style>/gi, '');
+  let text = html.replace(/<script\b[^<]*(?:(?!<\/script\s*>)<[^<]*)*<\/script\s*>/gi, '');
+  text = text.replace(/<style\b[^<]*(?:(?!<\/style\s*>)<[^<]*)*<\/style\s*>/gi, '');
 
   // Remove HTML comments
   text = text.replace(/<!--[\s\S]*?-->/g, '');
 
+  // Truncate only now, so the cut can't land inside a script/style block or
+  // comment; drop a tag the cut left half-open
+  if (text.length > MAX_HTML_SCAN_LENGTH) {
+    text = text.substring(0, MAX_HTML_SCAN_LENGTH).replace(/<[a-z\/!][^>]*$/i, '');
+  }
+
   // PRESERVE STRUCTURE BEFORE REMOVING TAGS
   // Convert table rows to newlines (preserve table structure)
   text = text.replace(/<\/tr>/gi, '\n');
@@ -711,16 +737,7 @@ function stripHtml(html) {
   text = text.replace(/<[^>]+>/g, ' ');
 
   // Decode common HTML entities
-  text = text.replace(/&nbsp;/g, ' ');
-  text = text.replace(/&amp;/g, '&');
-  text = text.replace(/&lt;/g, '<');
-  text = text.replace(/&gt;/g, '>');
-  text = text.replace(/&quot;/g, '"');
-  text = text.replace(/&#39;/g, "'");
-  text = text.replace(/&apos;/g, "'");
-  text = text.replace(/&mdash;/g, '—');
-  text = text.replace(/&ndash;/g, '–');
-  text = text.replace(/&hellip;/g, '...');
+  text = text.replace(HTML_ENTITY_REGEX, entity => HTML_ENTITIES[entity]);
 
   // Clean up whitespace MORE CAREFULLY (preserve paragraph structure)
   // Replace multiple spaces with single space (but preserve newlines)
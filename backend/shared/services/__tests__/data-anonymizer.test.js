@@ -0,0 +1,228 @@
+/**
+ * Data Anonymizer Unit Tests
+ * Tests PII scrubbing and anonymization output
+ *
+ * Run with: npm test -- data-anonymizer.test.js
+ */
+
+// Keep the audit log off disk - the anonymizer is a singleton that writes to
+// backend/data on load
+jest.mock('fs', () => {
+  const actual = jest.requireActual('fs');
+  return {
+    ...actual,
+    appendFileSync: jest.fn(),
+    promises: {
+      mkdir: jest.fn(),
+      access: jest.fn(),
+      writeFile: jest.fn(),
+      appendFile: jest.fn(),
+      readFile: jest.fn()
+    }
+  };
+});
+
+jest.mock('../../config/logger', () => ({
+  info: jest.fn(),
+  warn: jest.fn(),
+  error: jest.fn()
+}));
+
+const fs = require('fs');
+const anonymizer = require('../data-anonymizer');
+
+describe('Data Anonymizer', () => {
+  // Don't let entries buffered by one test land in the next
+  afterEach(() => anonymizer.flushAuditLog());
+
+  describe('scrubPII', () => {
+    test('should replace email addresses with a deterministic anonymized address', () => {
+      const result = anonymizer.scrubPII('Contact john.doe@example.com today');
+
+      expect(result).toBe(`Contact ${anonymizer.deriveAnonymizedEmail('john.doe@example.com')} today`);
+      expect(result).toMatch(/user_[0-9a-f]{8}@anonymized\.test/);
+    });
+
+    test('should redact phone numbers', () => {
+      expect(anonymizer.scrubPII('Call (555) 123-4567 now')).toBe('Call [PHONE_REDACTED] now');
+      expect(anonymizer.scrubPII('Call 555.123.4567 now')).toBe('Call [PHONE_REDACTED] now');
+    });
+
+    test('should redact SSNs', () => {
+      expect(anonymizer.scrubPII('SSN: 123-45-6789')).toBe('SSN: [SSN_REDACTED]');
+    });
+
+    test('should redact credit card numbers', () => {
+      expect(anonymizer.scrubPII('Card 4111-1111-1111-1111 on file')).toBe('Card [CARD_REDACTED] on file');
+    });
+
+    test('should anonymize titled names', () => {
+      const result = anonymizer.scrubPII('Meeting with Dr. Jane Smith');
+
+      expect(result).toBe(`Meeting with ${anonymizer.deriveAnonymizedName('Dr. Jane Smith')}`);
+      expect(result).toMatch(/User [0-9A-F]{4}$/);
+    });
+
+    test('should redact a 16-digit card as a card, not a phone number', () => {
+      const result = anonymizer.scrubPII('Card 4111111111111111 charged');
+
+      expect(result).toBe('Card [CARD_REDACTED] charged');
+      expect(result).not.toContain('[PHONE_REDACTED]');
+    });
+
+    test('should give repeated addresses the same replacement', () => {
+      const result = anonymizer.scrubPII('From a@b.com, cc a@b.com and c@d.com');
+      const first = anonymizer.deriveAnonymizedEmail('a@b.com');
+
+      expect(result).toBe(`From ${first}, cc ${first} and ${anonymizer.deriveAnonymizedEmail('c@d.com')}`);
+      expect(first).not.toBe(anonymizer.deriveAnonymizedEmail('c@d.com'));
+    });
+
+    test('should not treat a pipe as part of the TLD', () => {
+      const result = anonymizer.scrubPII('see a@b.co|m');
+
+      expect(result).toBe(`see ${anonymizer.deriveAnonymizedEmail('a@b.co')}|m`);
+    });
+
+    test('should write one audit entry per call with per-type counts', () => {
+      const logSpy = jest.spyOn(anonymizer, 'logAnonymization').mockResolvedValue();
+
+      anonymizer.scrubPII('a@b.com, c@d.com, 555-123-4567');
+
+      expect(logSpy).toHaveBeenCalledTimes(1);
+      expect(logSpy).toHaveBeenCalledWith('pii_scrubbed', expect.objectContaining({
+        itemsRedacted: 3,
+        byType: { email: 2, phone: 1 }
+      }));
+    });
+
+    test('should return text without PII hints unchanged and unaudited', () => {
+      const logSpy = jest.spyOn(anonymizer, 'logAnonymization').mockResolvedValue();
+      const text = 'Thanks for your order, it ships soon.';
+
+      expect(anonymizer.scrubPII(text)).toBe(text);
+      expect(logSpy).not.toHaveBeenCalled();
+    });
+
+    test('should handle empty input', () => {
+      expect(anonymizer.scrubPII('')).toBe('');
+      expect(anonymizer.scrubPII(null)).toBeNull();
+    });
+  });
+
+  describe('anonymizeEmailObject', () => {
+    test('should scrub an email that only claims to be anonymized', () => {
+      const result = anonymizer.anonymizeEmailObject({
+        id: 'msg-1',
+        from: 'real.person@example.com',
+        body: 'Call me at 555-123-4567',
+        _anonymized: true
+      });
+
+      expect(result.from).toBe(anonymizer.deriveAnonymizedEmail('real.person@example.com'));
+      expect(result.body).toBe('Call me at [PHONE_REDACTED]');
+      expect(result.id).not.toBe('msg-1');
+    });
+
+    test('should return an object it already anonymized unchanged', () => {
+      const once = anonymizer.anonymizeEmailObject({
+        id: 'msg-2',
+        from: 'someone@example.com',
+        body: 'See you Tuesday'
+      });
+
+      expect(once._anonymized).toBe(true);
+      expect(anonymizer.anonymizeEmailObject(once)).toBe(once);
+    });
+  });
+
+  describe('audit log', () => {
+    let logFile;
+
+    // Let queued setImmediate callbacks and promise continuations run
+    const nextTick = () => new Promise(resolve => setImmediate(resolve));
+
+    beforeEach(() => {
+      logFile = '';
+      fs.promises.appendFile.mockImplementation(async (file, data) => {
+        logFile += data;
+      });
+      fs.promises.readFile.mockImplementation(async () => logFile);
+    });
+
+    test('should append entries in the order they were logged', async () => {
+      let releaseFirstWrite;
+      fs.promises.appendFile.mockImplementationOnce((file, data) => new Promise(resolve => {
+        releaseFirstWrite = () => {
+          logFile += data;
+          resolve();
+        };
+      }));
+
+      anonymizer.logAnonymization('first', {});
+      await nextTick();
+      const second = anonymizer.logAnonymization('second', {});
+      await nextTick();
+
+      // The second batch waits for the first write to finish
+      expect(fs.promises.appendFile).toHaveBeenCalledTimes(1);
+
+      releaseFirstWrite();
+      await second;
+
+      const operations = logFile.trim().split('\n').map(line => JSON.parse(line).operation);
+      expect(operations).toEqual(['first', 'second']);
+    });
+
+    test('should resolve the returned promise only after the entry is written', async () => {
+      let releaseWrite;
+      fs.promises.appendFile.mockImplementationOnce(() => new Promise(resolve => {
+        releaseWrite = resolve;
+      }));
+
+      let written = false;
+      anonymizer.logAnonymization('pending', {}).then(() => { written = true; });
+      await nextTick();
+      await nextTick();
+
+      expect(fs.promises.appendFile).toHaveBeenCalledTimes(1);
+      expect(written).toBe(false);
+
+      releaseWrite();
+      await nextTick();
+
+      expect(written).toBe(true);
+    });
+
+    test('should flush buffered entries before reading stats', async () => {
+      anonymizer.logAnonymization('pii_scrubbed', { byType: { phone: 2 } });
+
+      const stats = await anonymizer.getAnonymizationStats();
+
+      expect(stats.totalOperations).toBe(1);
+      expect(stats.piiByType).toEqual({ phone: 2 });
+    });
+
+    test('should cancel the scheduled flush when flushed manually', async () => {
+      const written = anonymizer.logAnonymization('manual', {});
+
+      await anonymizer.flushAuditLog();
+      await written;
+      await nextTick();
+
+      expect(fs.promises.appendFile).toHaveBeenCalledTimes(1);
+    });
+
+    test('should write buffered entries synchronously on exit', async () => {
+      const written = anonymizer.logAnonymization('exiting', {});
+
+      anonymizer.flushAuditLogSync();
+      await written;
+      await nextTick();
+
+      expect(fs.appendFileSync).toHaveBeenCalledTimes(1);
+      expect(fs.appendFileSync.mock.calls[0][1]).toContain('"operation":"exiting"');
+      expect(fs.promises.appendFile).not.toHaveBeenCalled();
+    });
+  });
+});
@@ -0,0 +1,295 @@
+/**
+ * Corpus Parser Unit Tests
+ * Tests mbox parsing, dedupe, sampling and sample output
+ *
+ * Run with: npm test -- corpus-parser.test.js
+ */
+
+const fs = require('fs');
+const os = require('os');
+const path = require('path');
+
+// Split the stream on "From " separator lines the way node-mbox does
+jest.mock('node-mbox', () => {
+  const { EventEmitter } = require('events');
+
+  return class MockMbox extends EventEmitter {
+    constructor(input) {
+      super();
+      let buffered = '';
+
+      input.on('data', chunk => {
+        buffered += chunk.toString('latin1');
+        let end;
+        while ((end = buffered.indexOf('\nFrom ', 1)) !== -1) {
+          this.emit('message', Buffer.from(buffered.slice(0, end + 1), 'latin1'));
+          buffered = buffered.slice(end + 1);
+        }
+      });
+
+      input.on('end', () => {
+        if (buffered) this.emit('message', Buffer.from(buffered, 'latin1'));
+        this.emit('end');
+      });
+    }
+
+    destroy() {}
+  };
+});
+
+jest.mock('mailparser', () => ({
+  simpleParser: jest.fn()
+}));
+
+const { simpleParser } = require('mailparser');
+const CorpusParser = require('../corpus-parser');
+
+/**
+ * Helper: Build one raw mbox message
+ */
+function buildMessage({ messageId, subject = 'Hello', body = 'Body text' } = {}) {
+  return [
+    'From sender@example.com Mon Jan  1 00:00:00 2024',
+    ...(messageId === undefined ? [] : [`Message-ID: ${messageId}`]),
+    `Subject: ${subject}`,
+    'From: Sender <sender@example.com>',
+    '',
+    body,
+    ''
+  ].join('\n');
+}
+
+/**
+ * Helper: Build mbox contents with one message per Message-ID in [from, to)
+ */
+function buildMbox(from, to) {
+  let mbox = '';
+  for (let i = from; i < to; i++) {
+    mbox += buildMessage({ messageId: `<msg-${i}@example.com>`, subject: `Subject ${i}` });
+  }
+  return mbox;
+}
+
+describe('CorpusParser', () => {
+  let corpusDir;
+  let parser;
+
+  const writeMbox = (filename, contents) => {
+    const filePath = path.join(corpusDir, filename);
+    fs.writeFileSync(filePath, contents);
+    return filePath;
+  };
+
+  beforeEach(() => {
+    corpusDir = fs.mkdtempSync(path.join(os.tmpdir(), 'corpus-parser-'));
+    parser = new CorpusParser(corpusDir);
+
+    simpleParser.mockImplementation(async (source) => {
+      const raw = source.toString();
+      const subject = raw.match(/^Subject: (.*)$/m);
+      return {
+        subject: subject ? subject[1] : '',
+        text: raw.split('\n\n').slice(1).join('\n\n'),
+        attachments: []
+      };
+    });
+
+    jest.spyOn(console, 'log').mockImplementation(() => {});
+    jest.spyOn(process.stdout, 'write').mockImplementation(() => true);
+  });
+
+  afterEach(() => {
+    fs.rmSync(corpusDir, { recursive: true, force: true });
+  });
+
+  describe('parseMboxFile', () => {
+    test('should parse every message in the file', async () => {
+      const mboxPath = writeMbox('inbox.mbox', buildMbox(0, 5));
+
+      const emails = await parser.parseMboxFile(mboxPath);
+
+      expect(emails).toHaveLength(5);
+      expect(emails.map(e => e.subject).sort()).toEqual(
+        ['Subject 0', 'Subject 1', 'Subject 2', 'Subject 3', 'Subject 4']
+      );
+      expect(emails[0].snippet).toBe('Body text');
+    });
+
+    test('should stop at the limit', async () => {
+      const mboxPath = writeMbox('inbox.mbox', buildMbox(0, 50));
+
+      const emails = await parser.parseMboxFile(mboxPath, { limit: 10 });
+
+      expect(emails).toHaveLength(10);
+    });
+
+    test('should pass emails to onEmail instead of collecting them', async () => {
+      const mboxPath = writeMbox('inbox.mbox', buildMbox(0, 3));
+      const received = [];
+
+      const emails = await parser.parseMboxFile(mboxPath, { onEmail: email => received.push(email) });
+
+      expect(emails).toHaveLength(0);
+      expect(received).toHaveLength(3);
+    });
+
+    test('should skip repeated Message-IDs within a file', async () => {
+      const mboxPath = writeMbox('inbox.mbox', buildMbox(0, 3) + buildMbox(1, 3));
+
+      const emails = await parser.parseMboxFile(mboxPath);
+
+      expect(emails).toHaveLength(3);
+      expect(parser.stats.duplicatesSkipped).toBe(2);
+    });
+
+    test('should start with fresh dedupe state on each call', async () => {
+      const mboxPath = writeMbox('inbox.mbox', buildMbox(0, 5));
+
+      const first = await parser.parseMboxFile(mboxPath);
+      const second = await parser.parseMboxFile(mboxPath);
+
+      expect(first).toHaveLength(5);
+      expect(second).toHaveLength(5);
+      expect(parser.stats.duplicatesSkipped).toBe(0);
+    });
+
+    test('should dedupe across files that share a seen set', async () => {
+      const inbox = writeMbox('inbox.mbox', buildMbox(0, 5));
+      const starred = writeMbox('starred.mbox', buildMbox(3, 8));
+      const seen = new Set();
+
+      const fromInbox = await parser.parseMboxFile(inbox, { seen });
+      const fromStarred = await parser.parseMboxFile(starred, { seen });
+
+      expect(fromInbox).toHaveLength(5);
+      expect(fromStarred.map(e => e.subject).sort()).toEqual(['Subject 5', 'Subject 6', 'Subject 7']);
+    });
+
+    test('should dedupe messages without a Message-ID by their content', async () => {
+      const mboxPath = writeMbox('inbox.mbox', [
+        buildMessage({ subject: '(no subject)', body: 'First body' }),
+        buildMessage({ subject: '(no subject)', body: 'Second body' }),
+        buildMessage({ subject: '(no subject)', body: 'First body' })
+      ].join(''));
+
+      const emails = await parser.parseMboxFile(mboxPath);
+
+      expect(emails).toHaveLength(2);
+      expect(parser.stats.duplicatesSkipped).toBe(1);
+    });
+
+    test('should not read the next header as an empty Message-ID', async () => {
+      const mboxPath = writeMbox('inbox.mbox', [
+        buildMessage({ messageId: '', subject: 'First' }),
+        buildMessage({ messageId: '', subject: 'Second' })
+      ].join(''));
+
+      const emails = await parser.parseMboxFile(mboxPath);
+
+      expect(emails).toHaveLength(2);
+    });
+  });
+
+  describe('getDedupeKey', () => {
+    test('should use the Message-ID when present', () => {
+      const key = parser.getDedupeKey(Buffer.from(buildMessage({ messageId: '<a@example.com>' })));
+
+      expect(key).toBe('<a@example.com>');
+    });
+
+    test('should follow a folded Message-ID header', () => {
+      const msg = Buffer.from('Message-ID:\n <folded@example.com>\nSubject: Hi\n\nBody\n');
+
+      expect(parser.getDedupeKey(msg)).toBe('<folded@example.com>');
+    });
+
+    test('should fall back to a content hash without a Message-ID', () => {
+      const key = parser.getDedupeKey(Buffer.from(buildMessage({ messageId: '' })));
+
+      expect(key).toMatch(/^sha1:[0-9a-f]{40}$/);
+    });
+  });
+
+  describe('sampleEmails', () => {
+    test('should return sampleSize distinct emails from overlapping files', async () => {
+      writeMbox('inbox.mbox', buildMbox(0, 40));
+      writeMbox('starred.mbox', buildMbox(0, 40));
+
+      const sample = await parser.sampleEmails({ sampleSize: 20 });
+
+      expect(sample).toHaveLength(20);
+      expect(new Set(sample.map(e => e.subject)).size).toBe(20);
+    });
+
+    test('should not dedupe against an earlier run', async () => {
+      writeMbox('inbox.mbox', buildMbox(0, 10));
+
+      const first = await parser.sampleEmails({ sampleSize: 10 });
+      const second = await parser.sampleEmails({ sampleSize: 10 });
+
+      expect(first).toHaveLength(10);
+      expect(second).toHaveLength(10);
+    });
+  });
+
+  describe('createReservoir', () => {
+    test('should keep at most k distinct items', () => {
+      const reservoir = parser.createReservoir(10);
+
+      for (let i = 0; i < 1000; i++) {
+        reservoir.add(i);
+      }
+
+      expect(reservoir.items).toHaveLength(10);
+      expect(new Set(reservoir.items).size).toBe(10);
+    });
+
+    test('should keep everything when fewer than k items are added', () => {
+      const reservoir = parser.createReservoir(10);
+
+      [1, 2, 3].forEach(item => reservoir.add(item));
+
+      expect(reservoir.items).toEqual([1, 2, 3]);
+    });
+  });
+
+  describe('saveEmails', () => {
+    const emails = [
+      { subject: 'First', snippet: 'one' },
+      { subject: 'Second', snippet: 'two' }
+    ];
+
+    test('should write a JSON array', () => {
+      const outputPath = path.join(corpusDir, 'sample.json');
+
+      parser.saveEmails(emails, outputPath);
+
+      expect(JSON.parse(fs.readFileSync(outputPath, 'utf8'))).toEqual(emails);
+    });
+
+    test('should write an empty JSON array for no emails', () => {
+      const outputPath = path.join(corpusDir, 'sample.json');
+
+      parser.saveEmails([], outputPath);
+
+      expect(JSON.parse(fs.readFileSync(outputPath, 'utf8'))).toEqual([]);
+    });
+
+    test('should write one JSON record per line for .jsonl', () => {
+      const outputPath = path.join(corpusDir, 'sample.jsonl');
+
+      parser.saveEmails(emails, outputPath);
+
+      const lines = fs.readFileSync(outputPath, 'utf8').split('\n').filter(Boolean);
+      expect(lines.map(line => JSON.parse(line))).toEqual(emails);
+    });
+
+    test('should write an empty file for no emails as .jsonl', () => {
+      const outputPath = path.join(corpusDir, 'sample.jsonl');
+
+      parser.saveEmails([], outputPath);
+
+      expect(fs.readFileSync(outputPath, 'utf8')).toBe('');
+    });
+  });
+});
@@ -6,9 +6,56 @@
 
 const fs = require('fs');
 const path = require('path');
+const crypto = require('crypto');
 const Mbox = require('node-mbox');
 const {simpleParser} = require('mailparser');
 
+// Read mbox files in 1 MiB chunks (fs default is 64 KiB) to cut read syscalls
+// on multi-GB Takeout archives
+const MBOX_READ_CHUNK_SIZE = 1024 * 1024;
+
+// Flush threshold (in characters) when writing sampled emails to disk
+const SAVE_FLUSH_SIZE = 1024 * 1024;
+
+// Max messages parsing at once per mbox file. Reading pauses at this depth and
+// resumes once half have drained, so a fast disk can't queue up unbounded
+// raw messages ahead of simpleParser
+const MAX_IN_FLIGHT_PARSES = 64;
+
+// Mbox files parsed at once by sampleEmails. A few overlap disk reads with
+// MIME parsing; more just thrash the disk and interleave progress output
+const MBOX_FILE_CONCURRENCY = 3;
+
+// How far into a raw message to look for the end of the header block
+const HEADER_SCAN_LIMIT = 64 * 1024;
+
+// Headers read from the raw header block when deduping. The Message-ID value
+// may only continue onto a folded line, so an empty header never captures
+// the next header's name
+const MESSAGE_ID_HEADER_REGEX = /^message-id:[ \t]*(?:\r?\n[ \t]+)?(\S+)/im;
+const SUBJECT_HEADER_REGEX = /^subject:[ \t]*(.*)$/im;
+const FROM_HEADER_REGEX = /^from:[ \t]*(.*)$/im;
+const DATE_HEADER_REGEX = /^date:[ \t]*(.*)$/im;
+
+// Top-level multipart/mixed - how a message with attachments is packaged.
+// Stands in for mailparser's attachment list when only a prefix is parsed
+const MIXED_CONTENT_TYPE_REGEX = /^content-type:[ \t]*(?:\r?\n[ \t]+)?multipart\/mixed\b/im;
+
+// Body bytes parsed in skipBodyParsing mode - enough for the snippet
+const SNIPPET_SCAN_BYTES = 8 * 1024;
+
+// Body bytes folded into the dedupe key for messages with no Message-ID
+const DEDUPE_BODY_PREFIX = 256;
+
+// parseMessage only reads text/html/attachments, so skip the mailparser passes
+// that build other output: inlining cid: images into the HTML as base64 data
+// URIs, and rendering/linkifying the text body into textAsHtml
+const PARSER_OPTIONS = {
+  skipImageLinks: true,
+  skipTextToHtml: true,
+  skipTextLinks: true
+};
+
 class CorpusParser {
   constructor(corpusPath) {
     this.corpusPath = corpusPath;
@@ -17,76 +64,209 @@ class CorpusParser {
       totalEmails: 0,
       totalSize: 0,
       byFolder: {},
-      parseErrors: 0
+      parseErrors: 0,
+      duplicatesSkipped: 0
     };
+
+    // Mbox listing from the first scanCorpus() call, reused by later calls
+    this.mboxFiles = null;
   }
 
   /**
    * Parse single mbox file and extract emails
    * @param {string} mboxPath - Path to mbox file
    * @param {Object} options - Parsing options
-   * @returns {Promise<Array>} Parsed emails
+   * @param {boolean} options.skipBodyParsing - Skip full body parsing; emails
+   *   keep their headers and snippet but have empty textBody/htmlBody
+   * @param {Function} options.onEmail - Receives each parsed email instead of
+   *   collecting them, so memory stays flat however large the file is
+   * @param {Set} options.seen - Dedupe keys shared across calls; messages
+   *   already in it are skipped. Defaults to a fresh set for this file only
+   * @returns {Promise<Array>} Parsed emails (empty when onEmail is given)
    */
   async parseMboxFile(mboxPath, options = {}) {
     const {
       limit = null,
       skipBodyParsing = false,
-      onProgress = null
+      onProgress = null,
+      onEmail = null,
+      seen = new Set()
     } = options;
 
     return new Promise((resolve, reject) => {
       const emails = [];
-      const mbox = new Mbox(fs.createReadStream(mboxPath));
+      const input = fs.createReadStream(mboxPath, { highWaterMark: MBOX_READ_CHUNK_SIZE });
+      const mbox = new Mbox(input);
+      const pending = new Set();
       let count = 0;
+      let finished = false;
+
+      // Resolve only once in-flight parses settle, otherwise emails still
+      // inside simpleParser when the stream ends are silently dropped
+      const finish = () => {
+        if (finished) return;
+        finished = true;
+        Promise.all(pending).then(() => resolve(emails));
+      };
 
-      mbox.on('message', async (msg) => {
-        try {
-          count++;
+      mbox.on('message', (msg) => {
+        if (finished) return;
+
+        // Skip messages already seen here or, through options.seen, in
+        // another mbox file of the same run - cheaper than running them
+        // through simpleParser and deduping afterwards. The header block is
+        // sliced once here and shared with parseMessage
+        const headerBlock = this.extractHeaderBlock(msg);
+        const dedupeKey = this.getDedupeKey(msg, headerBlock);
+        if (seen.has(dedupeKey)) {
+          this.stats.duplicatesSkipped++;
+          return;
+        }
 
-          // Progress callback
-          if (onProgress && count % 100 === 0) {
-            onProgress(count, path.basename(mboxPath));
-          }
+        count++;
 
-          // Limit check
-          if (limit && count > limit) {
-            mbox.destroy();
-            resolve(emails);
-            return;
-          }
+        // Progress callback
+        if (onProgress && count % 100 === 0) {
+          onProgress(count, path.basename(mboxPath));
+        }
 
-          // Parse email
-          const parsed = await simpleParser(msg);
-
-          const email = {
-            subject: parsed.subject || '',
-            from: parsed.from?.text || '',
-            to: parsed.to?.text || '',
-            date: parsed.date ? parsed.date.toISOString() : '',
-            textBody: skipBodyParsing ? '' : (parsed.text || ''),
-            htmlBody: skipBodyParsing ? '' : (parsed.html || ''),
-            snippet: this.extractSnippet(parsed.text),
-            size: msg.length,
-            hasAttachments: parsed.attachments?.length > 0
-          };
-
-          emails.push(email);
-        } catch (err) {
-          this.stats.parseErrors++;
-          console.error(`Error parsing email: ${err.message}`);
+        // Limit check - stop pulling the file off disk as soon as we have
+        // enough, rather than streaming the rest of a multi-GB mbox
+        if (limit && count > limit) {
+          input.destroy();
+          mbox.destroy();
+          finish();
+          return;
         }
-      });
 
-      mbox.on('end', () => {
-        resolve(emails);
+        seen.add(dedupeKey);
+
+        const task = this.parseMessage(msg, { skipBodyParsing, headerBlock })
+          .then(email => {
+            if (onEmail) {
+              onEmail(email);
+            } else {
+              emails.push(email);
+            }
+          })
+          .catch(err => {
+            this.stats.parseErrors++;
+            console.error(`Error parsing email: ${err.message}`);
+          })
+          .finally(() => {
+            pending.delete(task);
+            if (!finished && input.isPaused() && pending.size <= MAX_IN_FLIGHT_PARSES / 2) {
+              input.resume();
+            }
+          });
+
+        pending.add(task);
+        if (pending.size >= MAX_IN_FLIGHT_PARSES) {
+          input.pause();
+        }
       });
 
+      mbox.on('end', finish);
+
       mbox.on('error', (err) => {
-        reject(err);
+        if (!finished) {
+          reject(err);
+        }
       });
     });
   }
 
+  /**
+   * Slice the header block (everything before the first blank line) off a raw message
+   * @param {Buffer} msg - Raw RFC 822 message
+   * @returns {Buffer} Header bytes
+   */
+  extractHeaderBlock(msg) {
+    // latin1 maps bytes 1:1 to chars, so string offsets are byte offsets
+    const head = msg.toString('latin1', 0, Math.min(msg.length, HEADER_SCAN_LIMIT));
+    const headerEnd = head.search(/\r?\n\r?\n/);
+    return msg.subarray(0, headerEnd === -1 ? head.length : headerEnd);
+  }
+
+  /**
+   * Read the Message-ID header without a full MIME parse
+   * @param {string} headers - Header block text
+   * @returns {string|null} Message-ID, or null if the message has none
+   */
+  extractMessageId(headers) {
+    const match = headers.match(MESSAGE_ID_HEADER_REGEX);
+    return match ? match[1] : null;
+  }
+
+  /**
+   * Key identifying a message across mbox files: its Message-ID, or for
+   * messages without one a hash of subject, sender, date and the start of
+   * the body - never the subject alone, which collides on "(no subject)"
+   * @param {Buffer} msg - Raw RFC 822 message
+   * @param {Buffer} headerBlock - msg's header block, from extractHeaderBlock
+   * @returns {string} Dedupe key
+   */
+  getDedupeKey(msg, headerBlock = this.extractHeaderBlock(msg)) {
+    const headers = headerBlock.toString('latin1');
+
+    const messageId = this.extractMessageId(headers);
+    if (messageId) return messageId;
+
+    const header = (regex) => {
+      const match = headers.match(regex);
+      return match ? match[1].trim() : '';
+    };
+
+    // Skip the blank line (\n\n or \r\n\r\n) that ends the header block
+    const bodyStart = headerBlock.length + (msg[headerBlock.length] === 0x0d ? 4 : 2);
+
+    return 'sha1:' + crypto.createHash('sha1')
+      .update(`${header(SUBJECT_HEADER_REGEX)}\0${header(FROM_HEADER_REGEX)}\0${header(DATE_HEADER_REGEX)}\0`)
+      .update(msg.subarray(bodyStart, bodyStart + DEDUPE_BODY_PREFIX))
+      .digest('hex');
+  }
+
+  /**
+   * Parse a single raw message from an mbox file
+   * @param {Buffer} msg - Raw RFC 822 message
+   * @param {Object} options - Parsing options
+   * @param {boolean} options.skipBodyParsing - Parse headers and only the start
+   *   of the body; textBody/htmlBody are left empty, snippet is still filled
+   *   and hasAttachments comes from the top-level Content-Type
+   * @param {Buffer} options.headerBlock - msg's header block, if already sliced
+   * @returns {Promise<Object>} Parsed email
+   */
+  async parseMessage(msg, options = {}) {
+    const { skipBodyParsing = false } = options;
+    const headerBlock = skipBodyParsing ? (options.headerBlock || this.extractHeaderBlock(msg)) : null;
+
+    // Header-only callers never look at the full body, so don't make
+    // mailparser decode every MIME part and attachment just to throw them
+    // away - the first few KiB still decode to a snippet
+    const source = skipBodyParsing
+      ? msg.subarray(0, headerBlock.length + SNIPPET_SCAN_BYTES)
+      : msg;
+
+    const parsed = await simpleParser(source, PARSER_OPTIONS);
+
+    // Attachments usually start past the parsed prefix, so also go by how
+    // the message is packaged
+    const hasAttachments = parsed.attachments?.length > 0 ||
+      (skipBodyParsing && MIXED_CONTENT_TYPE_REGEX.test(headerBlock.toString('latin1')));
+
+    return {
+      subject: parsed.subject || '',
+      from: parsed.from?.text || '',
+      to: parsed.to?.text || '',
+      date: parsed.date ? parsed.date.toISOString() : '',
+      textBody: skipBodyParsing ? '' : (parsed.text || ''),
+      htmlBody: skipBodyParsing ? '' : (parsed.html || ''),
+      snippet: this.extractSnippet(parsed.text),
+      size: msg.length,
+      hasAttachments
+    };
+  }
+
   /**
    * Extract snippet from email body
    * @param {string} text - Email body text
@@ -99,13 +279,26 @@ class CorpusParser {
 
   /**
    * Scan corpus directory and list all mbox files
+   * The listing is cached per instance, so the CLI's scan and sampleEmails
+   * share one directory walk; pass refresh to re-read the directory
+   * @param {Object} options - Scan options
+   * @param {boolean} options.refresh - Ignore the cached listing
    * @returns {Array} List of mbox files with metadata
    */
-  scanCorpus() {
-    const files = fs.readdirSync(this.corpusPath);
-    const mboxFiles = files.filter(f => f.endsWith('.mbox'));
+  scanCorpus(options = {}) {
+    const { refresh = false } = options;
+
+    if (this.mboxFiles && !refresh) {
+      return this.mboxFiles;
+    }
 
-    return mboxFiles.map(filename => {
+    // Dirent types come back with the listing, so subfolders and other
+    // non-files are dropped without a stat call each
+    const mboxFiles = fs.readdirSync(this.corpusPath, { withFileTypes: true })
+      .filter(entry => entry.isFile() && entry.name.endsWith('.mbox'))
+      .map(entry => entry.name);
+
+    this.mboxFiles = mboxFiles.map(filename => {
       const filepath = path.join(this.corpusPath, filename);
       const stats = fs.statSync(filepath);
 
@@ -117,6 +310,8 @@ class CorpusParser {
         modified: stats.mtime.toISOString()
       };
     }).sort((a, b) => b.size - a.size);
+
+    return this.mboxFiles;
   }
 
   /**
@@ -139,7 +334,6 @@ class CorpusParser {
 
     console.log(`\n📧 Sampling ${sampleSize} emails from ${mboxFiles.length} mbox files...\n`);
 
-    const allEmails = [];
     const filesPerMbox = Math.ceil(sampleSize / mboxFiles.length);
 
     // If seedFile specified, use only that file
@@ -147,37 +341,87 @@ class CorpusParser {
       ? mboxFiles.filter(f => f.filename === seedFile)
       : mboxFiles;
 
-    for (const mboxFile of filesToProcess) {
+    // Every file streams into one reservoir, so only sampleSize emails are
+    // ever held no matter how many files or how large the per-file limit
+    const reservoir = this.createReservoir(sampleSize);
+
+    // Takeout exports overlap (Starred/Opened messages also live in Inbox),
+    // so share dedupe keys across this run's files and skip repeats before
+    // parsing. A fresh set per run keeps repeated calls independent
+    const seen = new Set();
+
+    const processFile = async (mboxFile) => {
       console.log(`   Processing ${mboxFile.filename} (${mboxFile.sizeGB}GB)...`);
 
+      let extracted = 0;
       try {
-        const emails = await this.parseMboxFile(mboxFile.filepath, {
+        await this.parseMboxFile(mboxFile.filepath, {
           limit: filesPerMbox,
+          seen,
           onProgress: (count, filename) => {
             process.stdout.write(`\r   ${filename}: ${count} emails parsed...`);
+          },
+          onEmail: (email) => {
+            // Add source metadata
+            email.sourceFile = mboxFile.filename;
+            extracted++;
+            reservoir.add(email);
           }
         });
 
-        // Add source metadata
-        emails.forEach(email => {
-          email.sourceFile = mboxFile.filename;
-        });
-
-        allEmails.push(...emails);
-        console.log(`\n   ✅ Extracted ${emails.length} emails from ${mboxFile.filename}`);
-
-        // Stop if we have enough emails
-        if (allEmails.length >= sampleSize) {
-          break;
-        }
+        console.log(`\n   ✅ Extracted ${extracted} emails from ${mboxFile.filename}`);
       } catch (err) {
         console.error(`   ❌ Error processing ${mboxFile.filename}: ${err.message}`);
       }
+    };
+
+    // Mbox files are independent, so a few workers parse them concurrently:
+    // reads from one file overlap with MIME parsing of another. Each worker
+    // takes the next file (largest first) as soon as its current one is done
+    let nextFile = 0;
+    const worker = async () => {
+      while (nextFile < filesToProcess.length) {
+        await processFile(filesToProcess[nextFile++]);
+      }
+    };
+
+    const workerCount = Math.min(MBOX_FILE_CONCURRENCY, filesToProcess.length);
+    await Promise.all(Array.from({ length: workerCount }, worker));
+
+    // Shuffle so sources are interleaved
+    const sample = reservoir.items;
+    for (let i = sample.length - 1; i > 0; i--) {
+      const j = Math.floor(Math.random() * (i + 1));
+      [sample[i], sample[j]] = [sample[j], sample[i]];
     }
 
-    // Shuffle and limit to exact sample size
-    const shuffled = allEmails.sort(() => Math.random() - 0.5);
-    return shuffled.slice(0, sampleSize);
+    return sample;
+  }
+
+  /**
+   * Uniform random sample of k items fed one at a time (Algorithm R)
+   * Keeps only k items in memory, so it works over streamed input
+   * @param {number} k - Sample size
+   * @returns {Object} Reservoir with add(item) and the sampled items
+   */
+  createReservoir(k) {
+    const items = [];
+    let seen = 0;
+
+    return {
+      items,
+      add(item) {
+        if (seen < k) {
+          items.push(item);
+        } else {
+          const j = Math.floor(Math.random() * (seen + 1));
+          if (j < k) {
+            items[j] = item;
+          }
+        }
+        seen++;
+      }
+    };
   }
 
   /**
@@ -234,12 +478,33 @@ class CorpusParser {
   }
 
   /**
-   * Save emails to JSON file
+   * Save emails to JSON file, or JSON Lines if outputPath ends in .jsonl
    * @param {Array} emails - Emails to save
    * @param {string} outputPath - Output file path
    */
   saveEmails(emails, outputPath) {
-    fs.writeFileSync(outputPath, JSON.stringify(emails, null, 2));
+    // JSON Lines drops the array brackets and separators so readers can
+    // stream the file a record at a time instead of parsing it whole
+    const jsonLines = outputPath.endsWith('.jsonl');
+
+    // Write one compact record per line in buffered chunks instead of building
+    // a single pretty-printed string for the whole sample in memory
+    const fd = fs.openSync(outputPath, 'w');
+    try {
+      let buffer = jsonLines ? '' : '[\n';
+      emails.forEach((email, i) => {
+        const separator = jsonLines || i === emails.length - 1 ? '\n' : ',\n';
+        buffer += JSON.stringify(email) + separator;
+        if (buffer.length >= SAVE_FLUSH_SIZE) {
+          fs.writeSync(fd, buffer);
+          buffer = '';
+        }
+      });
+      fs.writeSync(fd, jsonLines ? buffer : buffer + ']\n');
+    } finally {
+      fs.closeSync(fd);
+    }
+
     console.log(`\n💾 Saved ${emails.length} emails to ${outputPath}`);
     console.log(`📊 File size: ${(fs.statSync(outputPath).size / 1024 / 1024).toFixed(1)} MB`);
   }